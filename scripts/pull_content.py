@@ -1,711 +1,1762 @@
-#!/usr/bin/env python3
-"""
-Script to pull content from Engineering and Operations repositories
-and copy specific files to the central documentation repository.
-"""
-
-import json
-import os
-import shutil
-import subprocess
-import sys
-import fnmatch
-from pathlib import Path
-
-
-def load_config():
-    """Load configuration from config.json"""
-    script_dir = Path(__file__).parent
-    config_path = script_dir / "config.json"
-    
-    if not config_path.exists():
-        print(f"Error: Configuration file not found at {config_path}")
-        sys.exit(1)
-    
-    try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        
-        # Validate required fields
-        required_fields = ["messaging_core_repo", "virtual_golf_game_api_repo"]
-        for field in required_fields:
-            if field not in config:
-                print(f"Warning: Missing field '{field}' in config.json")
-        
-        return config
-    except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON in config.json: {e}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"Error: Failed to load config.json: {e}")
-        sys.exit(1)
-
-
-def ensure_temp_dir(temp_dir):
-    """Ensure temporary directory exists"""
-    temp_path = Path(temp_dir)
-    if temp_path.exists():
-        shutil.rmtree(temp_path)
-    temp_path.mkdir(parents=True, exist_ok=True)
-    return temp_path
-
-
-def clone_or_update_repo(repo_url, branch, temp_path, repo_name, token=None, commit_sha=None):
-    """Clone or update a repository, optionally checking out a specific commit"""
-    repo_path = temp_path / repo_name
-    
-    # Always clone fresh when using specific commit SHA
-    if commit_sha:
-        if repo_path.exists():
-            shutil.rmtree(repo_path)
-        print(f"Cloning {repo_name} repository to checkout commit {commit_sha[:7]}...")
-        clone_repo(repo_url, branch, repo_path, token)
-        
-        # Checkout the specific commit
-        try:
-            env = os.environ.copy()
-            env['GIT_TERMINAL_PROMPT'] = '0'
-            env['GIT_ASKPASS'] = 'echo'
-            result = subprocess.run(
-                ["git", "checkout", commit_sha],
-                cwd=repo_path,
-                check=True,
-                capture_output=True,
-                text=True,
-                env=env
-            )
-            print(f"  ✅ Checked out commit {commit_sha[:7]}")
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr if isinstance(e.stderr, str) else e.stderr.decode('utf-8', errors='ignore')
-            print(f"  ⚠️  Warning: Failed to checkout commit {commit_sha[:7]}: {error_msg}")
-            print(f"  → Will use latest branch ({branch}) instead")
-    else:
-        # Standard clone/update behavior for scheduled or manual triggers
-        if repo_path.exists():
-            print(f"Updating {repo_name} repository...")
-            try:
-                env = os.environ.copy()
-                env['GIT_TERMINAL_PROMPT'] = '0'
-                result = subprocess.run(
-                    ["git", "pull", "origin", branch],
-                    cwd=repo_path,
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                    env=env
-                )
-            except subprocess.CalledProcessError as e:
-                error_msg = e.stderr if isinstance(e.stderr, str) else e.stderr.decode('utf-8', errors='ignore')
-                print(f"Warning: Failed to update {repo_name} repo: {error_msg}")
-                print(f"Attempting fresh clone...")
-                shutil.rmtree(repo_path)
-                clone_repo(repo_url, branch, repo_path, token)
-        else:
-            print(f"Cloning {repo_name} repository...")
-            clone_repo(repo_url, branch, repo_path, token)
-    
-    return repo_path
-
-
-def clone_repo(repo_url, branch, target_path, token=None):
-    """Clone a repository to a specific path"""
-    try:
-        # If token is provided, inject it into the URL for authentication
-        authenticated_url = repo_url
-        if token and token.strip():
-            if repo_url.startswith("https://"):
-                # For GitHub, use token as username in HTTPS URL
-                # Format: https://<token>@github.com/org/repo.git
-                if "github.com" in repo_url:
-                    authenticated_url = repo_url.replace("https://", f"https://{token}@")
-                else:
-                    # For other Git hosts, use token as username
-                    authenticated_url = repo_url.replace("https://", f"https://{token}@")
-            elif repo_url.startswith("git@"):
-                # For SSH URLs, token won't work - use SSH keys instead
-                print(f"Warning: Token authentication not supported for SSH URLs. Using SSH keys.")
-                authenticated_url = repo_url
-        else:
-            # Check if this is a private repository that needs authentication
-            if "github.com" in repo_url and not repo_url.startswith("git@"):
-                print(f"⚠️  Warning: No authentication token provided for {repo_url}")
-                print(f"   If this is a private repository, set MESSAGING_CORE_REPO_TOKEN or VIRTUAL_GOLF_GAME_API_REPO_TOKEN")
-        
-        # Configure Git to not prompt for credentials
-        env = os.environ.copy()
-        env['GIT_TERMINAL_PROMPT'] = '0'
-        env['GIT_ASKPASS'] = 'echo'
-        
-        result = subprocess.run(
-            ["git", "clone", "-b", branch, "--depth", "1", authenticated_url, str(target_path)],
-            check=True,
-            capture_output=True,
-            text=True,
-            env=env
-        )
-        print(f"  ✅ Successfully cloned {repo_url}")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error: Failed to clone repository {repo_url}")
-        error_msg = e.stderr if isinstance(e.stderr, str) else e.stderr.decode('utf-8', errors='ignore')
-        stdout_msg = e.stdout if isinstance(e.stdout, str) else e.stdout.decode('utf-8', errors='ignore') if e.stdout else ""
-        print(f"Error details: {error_msg}")
-        if stdout_msg:
-            print(f"Output: {stdout_msg}")
-        
-        # Check for specific authentication errors
-        error_lower = error_msg.lower()
-        if "could not read username" in error_lower or "authentication" in error_lower or "permission" in error_lower or "credential" in error_lower:
-            print("\n🔐 Authentication Error Detected")
-            print("💡 Solution: Add GitHub Personal Access Token as repository secret")
-            print("\n   For messaging-core repository:")
-            print("   - Secret name: MESSAGING_CORE_REPO_TOKEN")
-            print("   - Token scopes needed: 'repo' (for private repos)")
-            print("\n   For virtual-golf-game-api repository:")
-            print("   - Secret name: VIRTUAL_GOLF_GAME_API_REPO_TOKEN")
-            print("   - Token scopes needed: 'repo' (for private repos)")
-            print("\n   Steps:")
-            print("   1. Create token: GitHub → Settings → Developer settings → Personal access tokens")
-            print("   2. Add token to central documentation repo → Settings → Secrets → Actions")
-            print("   3. Make sure token has 'repo' scope if repositories are private")
-        
-        sys.exit(1)
-
-
-def should_exclude_file(file_path, exclude_patterns):
-    """Check if a file should be excluded based on patterns"""
-    if not exclude_patterns:
-        return False
-    
-    file_name = file_path.name
-    file_path_str = str(file_path)
-    
-    for pattern in exclude_patterns:
-        if fnmatch.fnmatch(file_name, pattern) or fnmatch.fnmatch(file_path_str, pattern):
-            return True
-    return False
-
-
-def is_yaml_file(file_path):
-    """Return True for YAML files."""
-    suffix = file_path.suffix.lower()
-    return suffix in {".yml", ".yaml"}
-
-
-def write_yaml_markdown(source_file, dest_md, relative_source):
-    """Create a readable Markdown wrapper for YAML content."""
-    try:
-        yaml_content = source_file.read_text(encoding="utf-8", errors="ignore")
-    except OSError as e:
-        print(f"  [ERROR] Failed to read {relative_source}: {e}")
-        return False
-
-    dest_md.parent.mkdir(parents=True, exist_ok=True)
-    title = f"{source_file.name}"
-    markdown = (
-        f"# {title}\n\n"
-        f"Source: `{relative_source}`\n\n"
-        "```yaml\n"
-        f"{yaml_content}\n"
-        "```\n"
-    )
-    try:
-        dest_md.write_text(markdown, encoding="utf-8")
-        return True
-    except OSError as e:
-        print(f"  [ERROR] Failed to write {dest_md}: {e}")
-        return False
-
-
-def match_file_to_pattern(file_path, pattern_config, exclude_patterns):
-    """Check if a file matches a pattern configuration"""
-    source_pattern = pattern_config.get("source")
-    
-    # Convert Path object to string and normalize
-    if isinstance(file_path, Path):
-        file_path_str = str(file_path).replace("\\", "/")
-    else:
-        file_path_str = str(file_path).replace("\\", "/")
-    
-    # Normalize pattern
-    source_pattern = source_pattern.replace("\\", "/")
-    
-    # Check exclusions first (convert Path to string for exclusion check)
-    if should_exclude_file(Path(file_path_str) if not isinstance(file_path, Path) else file_path, exclude_patterns):
-        return False
-    
-    # Handle glob patterns
-    if "*" in source_pattern or "?" in source_pattern:
-        # For recursive patterns (**)
-        if "**" in source_pattern:
-            # Convert ** pattern to fnmatch pattern
-            # docs/**/*.md should match docs/any/path/file.md
-            pattern_parts = source_pattern.split("**")
-            if len(pattern_parts) == 2:
-                prefix = pattern_parts[0].rstrip("/")
-                suffix = pattern_parts[1].lstrip("/")
-                if not prefix:
-                    # **/*.md - match any file with that extension
-                    if fnmatch.fnmatch(file_path_str, f"*{suffix}") or fnmatch.fnmatch(file_path.name, suffix):
-                        return True
-                elif file_path_str.startswith(prefix):
-                    # docs/**/*.md - match docs/.../*.md
-                    remaining = file_path_str[len(prefix):].lstrip("/")
-                    if fnmatch.fnmatch(remaining, suffix) or fnmatch.fnmatch(remaining, f"*/{suffix}") or fnmatch.fnmatch(remaining, f"**/{suffix}"):
-                        return True
-            else:
-                # Multiple **, use simpler matching
-                if fnmatch.fnmatch(file_path_str, source_pattern.replace("**", "*")):
-                    return True
-        else:
-            # Simple glob pattern (no **)
-            if fnmatch.fnmatch(file_path_str, source_pattern):
-                return True
-    else:
-        # Exact match (no wildcards)
-        if file_path_str == source_pattern or file_path.name == source_pattern:
-            return True
-        # Also check if it's a directory pattern match
-        if source_pattern.endswith("/") and file_path_str.startswith(source_pattern.rstrip("/")):
-            return True
-    
-    return False
-
-
-def copy_changed_files(source_repo_path, changed_files_list, patterns, exclude_patterns, repo_name):
-    """Copy only the changed files that match the patterns"""
-    base_path = Path(__file__).parent.parent
-    docs_path = base_path / "docs"
-    
-    if not changed_files_list:
-        print("  [INFO] No changed files list provided")
-        return 0
-    
-    # Parse changed files (comma-separated)
-    changed_files = [f.strip() for f in changed_files_list.split(",") if f.strip()]
-    
-    if not changed_files:
-        print("  [INFO] No changed files to process")
-        return 0
-    
-    print(f"  Processing {len(changed_files)} changed file(s)...")
-    
-    copied_count = 0
-    matched_files = []
-    
-    # Find which changed files match our patterns
-    for changed_file in changed_files:
-        # Normalize path (handle both Windows and Unix paths)
-        changed_file_normalized = changed_file.replace("\\", "/")
-        file_path = source_repo_path / changed_file_normalized
-        
-        # Check if file exists (might have been deleted)
-        if not file_path.exists():
-            print(f"  [INFO] File no longer exists (deleted?): {changed_file}")
-            # TODO: Could delete from destination if needed
-            continue
-        
-        # Get relative path for pattern matching (relative to repo root)
-        try:
-            relative_path = file_path.relative_to(source_repo_path)
-        except ValueError:
-            # If path is not relative, try to make it relative
-            relative_path = Path(changed_file_normalized)
-        
-        # Check if file matches any pattern
-        for pattern_config in patterns:
-            dest_base = pattern_config.get("destination", "")
-            
-            # Use the actual file path for matching (pathlib Path object)
-            if match_file_to_pattern(relative_path, pattern_config, exclude_patterns):
-                matched_files.append((file_path, dest_base, changed_file_normalized))
-                break
-    
-    # Copy matched files
-    for source_file, dest_base, relative_path in matched_files:
-        # Determine destination path
-        if dest_base.endswith("/") or dest_base == "":
-            # Destination is a directory, preserve relative path structure
-            dest_file = docs_path / dest_base / relative_path
-        else:
-            # Destination is a specific file path
-            dest_file = docs_path / dest_base
-        
-        # Ensure destination directory exists
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Copy file (render YAML to Markdown instead of copying raw YAML)
-        try:
-            if is_yaml_file(source_file):
-                dest_md = dest_file.with_suffix(dest_file.suffix + ".md")
-                if write_yaml_markdown(source_file, dest_md, relative_path):
-                    print(f"  [OK] Rendered {relative_path} -> {dest_md.relative_to(docs_path)}")
-                    copied_count += 1
-            else:
-                shutil.copy2(source_file, dest_file)
-                print(f"  [OK] Copied {relative_path} -> {dest_file.relative_to(docs_path)}")
-                copied_count += 1
-        except Exception as e:
-            print(f"  [ERROR] Failed to copy {relative_path}: {e}")
-    
-    if not matched_files:
-        print(f"  [INFO] No changed files matched the configured patterns")
-        print(f"  Changed files: {', '.join(changed_files[:5])}{'...' if len(changed_files) > 5 else ''}")
-    
-    return copied_count
-
-
-def copy_files_by_pattern(source_repo_path, patterns, exclude_patterns, repo_name):
-    """Copy files from source repository using glob patterns"""
-    base_path = Path(__file__).parent.parent
-    docs_path = base_path / "docs"
-    
-    copied_count = 0
-    
-    for pattern_config in patterns:
-        if pattern_config.get("commit_only"):
-            continue
-        source_pattern = pattern_config.get("source")
-        dest_base = pattern_config.get("destination", "")
-        description = pattern_config.get("description", "")
-        
-        if description:
-            print(f"  Pattern: {description}")
-        
-        # Convert glob pattern to Path pattern
-        source_path_obj = source_repo_path / source_pattern
-        
-        # Find all matching files
-        if "*" in source_pattern or "?" in source_pattern:
-            # Use glob pattern matching
-            matching_files = []
-            if "**" in source_pattern:
-                # Handle recursive patterns without treating '**' as a real folder
-                prefix, _, suffix = source_pattern.partition("**")
-                base_dir = prefix.rstrip("/")
-                pattern_name = suffix.lstrip("/") or "*"
-                parent_dir = source_repo_path / base_dir if base_dir else source_repo_path
-                
-                if not parent_dir.exists():
-                    print(f"  [WARNING] Source directory does not exist: {parent_dir.relative_to(source_repo_path)}")
-                    continue
-                
-                for file_path in parent_dir.rglob(pattern_name):
-                    if file_path.is_file() and not should_exclude_file(file_path, exclude_patterns):
-                        matching_files.append(file_path)
-            else:
-                parent_dir = source_path_obj.parent
-                pattern_name = source_path_obj.name
-                
-                if not parent_dir.exists():
-                    print(f"  [WARNING] Source directory does not exist: {parent_dir.relative_to(source_repo_path)}")
-                    continue
-                
-                if pattern_config.get("recursive", False):
-                    # Recursive search
-                    for file_path in parent_dir.rglob(pattern_name):
-                        if file_path.is_file() and not should_exclude_file(file_path, exclude_patterns):
-                            matching_files.append(file_path)
-                else:
-                    # Non-recursive search
-                    for file_path in parent_dir.glob(pattern_name):
-                        if file_path.is_file() and not should_exclude_file(file_path, exclude_patterns):
-                            matching_files.append(file_path)
-        else:
-            # Single file or directory
-            if source_path_obj.exists():
-                matching_files = [source_path_obj] if source_path_obj.is_file() else list(source_path_obj.rglob("*")) if source_path_obj.is_dir() else []
-                matching_files = [f for f in matching_files if f.is_file() and not should_exclude_file(f, exclude_patterns)]
-        
-        # Copy matching files
-        for source_file in matching_files:
-            relative_path = source_file.relative_to(source_repo_path)
-            
-            # Determine destination path
-            if dest_base.endswith("/") or dest_base == "":
-                # Destination is a directory, preserve relative path structure
-                if source_pattern.endswith("/") or source_path_obj.is_dir():
-                    # Preserve directory structure
-                    dest_file = docs_path / dest_base / relative_path
-                else:
-                    # Just use the filename
-                    dest_file = docs_path / dest_base / source_file.name
-            else:
-                # Destination is a specific file path
-                dest_file = docs_path / dest_base
-            
-            # Ensure destination directory exists
-            dest_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Copy file (render YAML to Markdown instead of copying raw YAML)
-            try:
-                if is_yaml_file(source_file):
-                    dest_md = dest_file.with_suffix(dest_file.suffix + ".md")
-                    if write_yaml_markdown(source_file, dest_md, relative_path):
-                        print(f"  [OK] Rendered {relative_path} -> {dest_md.relative_to(docs_path)}")
-                        copied_count += 1
-                else:
-                    shutil.copy2(source_file, dest_file)
-                    print(f"  [OK] Copied {relative_path} -> {dest_file.relative_to(docs_path)}")
-                    copied_count += 1
-            except Exception as e:
-                print(f"  [ERROR] Failed to copy {relative_path}: {e}")
-        
-        if not matching_files:
-            print(f"  [INFO] No files matched pattern: {source_pattern}")
-    
-    return copied_count
-
-
-def copy_files(source_repo_path, file_mapping, repo_name):
-    """Copy files from source repository to documentation structure (static mapping)"""
-    base_path = Path(__file__).parent.parent
-    docs_path = base_path / "docs"
-    
-    copied_count = 0
-    for source_path, dest_path in file_mapping.items():
-        source_file = source_repo_path / source_path
-        dest_file = docs_path / dest_path
-        
-        if source_file.exists():
-            # Ensure destination directory exists
-            dest_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Copy file
-            shutil.copy2(source_file, dest_file)
-            print(f"  [OK] Copied {source_path} -> {dest_path}")
-            copied_count += 1
-        else:
-            print(f"  [WARNING] Source file not found: {source_path}")
-    
-    return copied_count
-
-
-def determine_repos_to_pull(config):
-    """
-    Determine which repositories to pull based on environment variables.
-    Returns a dict with flags for each repo.
-    """
-    # Get the triggering repository from environment (set by GitHub Actions)
-    trigger_repo = os.environ.get("TRIGGER_REPOSITORY", "").lower()
-    
-    # Default: pull from both repos (for cron, push, manual triggers)
-    pull_messaging_core = True
-    pull_virtual_golf_game_api = True
-    
-    # If triggered by repository_dispatch, only pull from the triggering repo
-    if trigger_repo:
-        print(f"📥 Triggered by repository: {trigger_repo}")
-        
-        # Check if it's messaging-core
-        if "messaging-core" in trigger_repo or "messaging_core" in trigger_repo:
-            pull_messaging_core = True
-            pull_virtual_golf_game_api = False
-            print("  → Will pull from: messaging-core only")
-        # Check if it's virtual-golf-game-api
-        elif "virtual-golf-game-api" in trigger_repo or "virtual_golf_game_api" in trigger_repo:
-            pull_messaging_core = False
-            pull_virtual_golf_game_api = True
-            print("  → Will pull from: virtual-golf-game-api only")
-        else:
-            # Unknown repo, pull from both to be safe
-            print(f"  ⚠️  Unknown repository '{trigger_repo}', will pull from both repos")
-    else:
-        print("📥 No specific repository trigger detected, will pull from both repos")
-    
-    return {
-        "messaging_core": pull_messaging_core,
-        "virtual_golf_game_api": pull_virtual_golf_game_api
-    }
-
-
-def main():
-    """Main function to pull content from repositories"""
-    print("=" * 60)
-    print("Pulling Content from External Repositories")
-    print("=" * 60)
-    
-    # Load configuration
-    config = load_config()
-    
-    # Determine which repos to pull based on trigger
-    repos_to_pull = determine_repos_to_pull(config)
-    
-    # Setup temporary directory
-    temp_dir = config.get("temp_dir", ".temp_repos")
-    temp_path = ensure_temp_dir(temp_dir)
-    
-    total_copied = 0
-    
-    # Get authentication tokens from environment variables (for GitHub Actions)
-    messaging_core_token = os.environ.get("MESSAGING_CORE_REPO_TOKEN")
-    virtual_golf_game_api_token = os.environ.get("VIRTUAL_GOLF_GAME_API_REPO_TOKEN")
-    
-    # Get commit info if triggered by repository_dispatch
-    trigger_commit = os.environ.get("TRIGGER_COMMIT", "")
-    trigger_changed_files = os.environ.get("TRIGGER_CHANGED_FILES", "")
-    trigger_repo = os.environ.get("TRIGGER_REPOSITORY", "").lower()
-    
-    # Determine if we should use commit-based pulling (only for repository_dispatch)
-    use_commit_based = bool(trigger_commit and trigger_changed_files)
-    
-    if use_commit_based:
-        print(f"\n📋 Commit-based pulling mode enabled")
-        print(f"   Commit: {trigger_commit[:7] if trigger_commit else 'N/A'}")
-        print(f"   Changed files: {len(trigger_changed_files.split(',')) if trigger_changed_files else 0} file(s)")
-    
-    # Process messaging-core repository
-    if "messaging_core_repo" in config and repos_to_pull["messaging_core"]:
-        print(f"\n[1/2] Processing messaging-core Repository...")
-        
-        # Get commit SHA if this is the triggering repo
-        commit_sha = trigger_commit if use_commit_based and "messaging-core" in trigger_repo else None
-        changed_files_list = trigger_changed_files if use_commit_based and "messaging-core" in trigger_repo else None
-        
-        messaging_core_repo_path = clone_or_update_repo(
-            config["messaging_core_repo"],
-            config.get("messaging_core_branch", "main"),
-            temp_path,
-            "engineering",
-            messaging_core_token,
-            commit_sha=commit_sha
-        )
-        
-        # Use commit-based copying if available, otherwise use pattern-based
-        copied = 0
-        if changed_files_list and "messaging_core_patterns" in config and config["messaging_core_patterns"]:
-            print("  Copying only changed files that match patterns...")
-            exclude_patterns = config.get("exclude_patterns", [])
-            copied = copy_changed_files(
-                messaging_core_repo_path,
-                changed_files_list,
-                config["messaging_core_patterns"],
-                exclude_patterns,
-                "messaging-core"
-            )
-            total_copied += copied
-
-        # Fallback if commit-based copy finds nothing (common on squash/merge commits)
-        if copied == 0:
-            # Fallback to pattern-based or static mapping (for scheduled/push/manual triggers)
-            # Process static file mappings (backward compatibility)
-            if "messaging_core_paths" in config and config["messaging_core_paths"]:
-                print("  Copying static file mappings...")
-                copied = copy_files(
-                    messaging_core_repo_path,
-                    config["messaging_core_paths"],
-                    "messaging-core"
-                )
-                total_copied += copied
-            
-            # Process pattern-based file copying (dynamic)
-            if "messaging_core_patterns" in config and config["messaging_core_patterns"]:
-                print("  Copying files using patterns...")
-                exclude_patterns = config.get("exclude_patterns", [])
-                copied = copy_files_by_pattern(
-                    messaging_core_repo_path,
-                    config["messaging_core_patterns"],
-                    exclude_patterns,
-                    "messaging-core"
-                )
-                total_copied += copied
-    elif repos_to_pull["messaging_core"]:
-        print("\n⚠️  Warning: messaging-core repository not configured in config.json")
-    else:
-        print("\n⏭️  Skipping messaging-core (not triggered by this repository)")
-    
-    # Process virtual-golf-game-api repository
-    if "virtual_golf_game_api_repo" in config and repos_to_pull["virtual_golf_game_api"]:
-        print(f"\n[2/2] Processing virtual-golf-game-api Repository...")
-        
-        # Get commit SHA if this is the triggering repo
-        commit_sha = trigger_commit if use_commit_based and "virtual-golf-game-api" in trigger_repo else None
-        changed_files_list = trigger_changed_files if use_commit_based and "virtual-golf-game-api" in trigger_repo else None
-        
-        virtual_golf_game_api_repo_path = clone_or_update_repo(
-            config["virtual_golf_game_api_repo"],
-            config.get("virtual_golf_game_api_branch", "main"),
-            temp_path,
-            "operations",
-            virtual_golf_game_api_token,
-            commit_sha=commit_sha
-        )
-        
-        # Use commit-based copying if available, otherwise use pattern-based
-        copied = 0
-        if changed_files_list and "virtual_golf_game_api_patterns" in config and config["virtual_golf_game_api_patterns"]:
-            print("  Copying only changed files that match patterns...")
-            exclude_patterns = config.get("exclude_patterns", [])
-            copied = copy_changed_files(
-                virtual_golf_game_api_repo_path,
-                changed_files_list,
-                config["virtual_golf_game_api_patterns"],
-                exclude_patterns,
-                "virtual-golf-game-api"
-            )
-            total_copied += copied
-
-        # Fallback if commit-based copy finds nothing (common on squash/merge commits)
-        if copied == 0:
-            # Fallback to pattern-based or static mapping (for scheduled/push/manual triggers)
-            # Process static file mappings (backward compatibility)
-            if "virtual_golf_game_api_paths" in config and config["virtual_golf_game_api_paths"]:
-                print("  Copying static file mappings...")
-                copied = copy_files(
-                    virtual_golf_game_api_repo_path,
-                    config["virtual_golf_game_api_paths"],
-                    "virtual-golf-game-api"
-                )
-                total_copied += copied
-            
-            # Process pattern-based file copying (dynamic)
-            if "virtual_golf_game_api_patterns" in config and config["virtual_golf_game_api_patterns"]:
-                print("  Copying files using patterns...")
-                exclude_patterns = config.get("exclude_patterns", [])
-                copied = copy_files_by_pattern(
-                    virtual_golf_game_api_repo_path,
-                    config["virtual_golf_game_api_patterns"],
-                    exclude_patterns,
-                    "virtual-golf-game-api"
-                )
-                total_copied += copied
-    elif repos_to_pull["virtual_golf_game_api"]:
-        print("\n⚠️  Warning: virtual-golf-game-api repository not configured in config.json")
-    else:
-        print("\n⏭️  Skipping virtual-golf-game-api (not triggered by this repository)")
-    
-    # Cleanup temporary directory
-    print(f"\nCleaning up temporary files...")
-    shutil.rmtree(temp_path)
-    
-    # Summary
-    print("\n" + "=" * 60)
-    if total_copied > 0:
-        print(f"[SUCCESS] Successfully copied {total_copied} file(s)")
-    else:
-        print("[WARNING] No files were copied. Check your configuration.")
-    print("=" * 60)
-    print("\nNext steps:")
-    print("  1. Review the copied files in the docs/ directory")
-    print("  2. Update mkdocs.yml navigation if new files were added")
-    print("  3. Build the documentation: mkdocs build")
-    print("  4. Serve locally: mkdocs serve")
-
-    # Clean up any raw YAML files under docs/ to avoid mkdocs path collisions
-    docs_root = Path(__file__).parent.parent / "docs"
-    if docs_root.exists():
-        removed_yaml = 0
-        for yaml_path in docs_root.rglob("*"):
-            if yaml_path.is_file() and yaml_path.suffix.lower() in {".yml", ".yaml"}:
-                try:
-                    yaml_path.unlink()
-                    removed_yaml += 1
-                except OSError as e:
-                    print(f"[WARNING] Failed to remove {yaml_path}: {e}")
-        if removed_yaml:
-            print(f"[INFO] Removed {removed_yaml} raw YAML file(s) from docs/")
-
-
-if __name__ == "__main__":
-    main()
-
+#!/usr/bin/env python3
+"""
+Script to pull content from Engineering and Operations repositories
+and copy specific files to the central documentation repository.
+"""
+
+import argparse
+import codecs
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import filecmp
+import fnmatch
+import functools
+import re
+import contextvars
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DOCS_PATH = SCRIPT_DIR.parent / "docs"
+
+# Source repositories: config key prefix, display name, clone directory
+# and the environment variable holding the access token
+REPOSITORIES = (
+    {
+        "key": "messaging_core",
+        "name": "messaging-core",
+        "dir_name": "engineering",
+        "token_env": "MESSAGING_CORE_REPO_TOKEN",
+    },
+    {
+        "key": "virtual_golf_game_api",
+        "name": "virtual-golf-game-api",
+        "dir_name": "operations",
+        "token_env": "VIRTUAL_GOLF_GAME_API_REPO_TOKEN",
+    },
+)
+
+
+# Destination directories created so far, shared by all copy functions
+_created_dirs = set()
+
+# Destination files written so far; a later copy to one is never skipped as unchanged
+_written_dests = set()
+
+# Numbers the directories discard_dir moves out of the way
+_trash_counter = itertools.count()
+
+# Oldest git versions supporting partial clone and 'sparse-checkout set --no-cone'
+PARTIAL_CLONE_MIN_GIT = (2, 19)
+SPARSE_CHECKOUT_MIN_GIT = (2, 35)
+CONFIG_ENV_MIN_GIT = (2, 31)
+
+# Turns Windows path separators into '/' in a single str.translate pass
+_SLASH_TABLE = str.maketrans("\\", "/")
+
+
+# Where ThreadOutput sends text printed in the current context (None: the real stream)
+_output_buffer = contextvars.ContextVar("output_buffer", default=None)
+
+
+class ThreadOutput:
+    """Stand-in for sys.stdout that buffers output printed by worker threads"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+    
+    def write(self, text):
+        buffer = _output_buffer.get()
+        return (self.stream if buffer is None else buffer).write(text)
+    
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+    
+    def run_buffered(self, buffer, func, *args, **kwargs):
+        """
+        Call func, collecting everything it prints into buffer, including
+        prints from pool threads it runs tasks on with the context copied
+        """
+        token = _output_buffer.set(buffer)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _output_buffer.reset(token)
+
+
+@functools.lru_cache(maxsize=1)
+def load_config():
+    """Load configuration from config.json (parsed once per process)"""
+    config_path = SCRIPT_DIR / "config.json"
+    
+    if not config_path.exists():
+        print(f"Error: Configuration file not found at {config_path}")
+        sys.exit(1)
+    
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        
+        # Validate required fields
+        required_fields = ["messaging_core_repo", "virtual_golf_game_api_repo"]
+        for field in required_fields:
+            if field not in config:
+                print(f"Warning: Missing field '{field}' in config.json")
+        
+        return config
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON in config.json: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error: Failed to load config.json: {e}")
+        sys.exit(1)
+
+
+def ensure_temp_dir(temp_dir, fresh=False):
+    """
+    Ensure temporary directory exists.
+    Clones are kept between runs so they can be updated incrementally;
+    fresh=True wipes them first.
+    """
+    temp_path = Path(temp_dir)
+    temp_path.mkdir(parents=True, exist_ok=True)
+    # Also finish deleting what an interrupted run left behind
+    for entry in os.scandir(temp_path):
+        if fresh or entry.name.startswith(".trash-"):
+            discard_dir(Path(entry.path))
+    return temp_path
+
+
+def discard_dir(path, trash_dir=None):
+    """
+    Delete a directory without waiting for it: it is renamed out of the way
+    (into trash_dir, by default its parent) and removed on a background
+    thread, which the interpreter joins before exiting.
+    """
+    if not path.is_dir() or path.is_symlink():
+        path.unlink()
+        return
+    trash = Path(trash_dir or path.parent) / f".trash-{os.getpid()}-{next(_trash_counter)}"
+    try:
+        os.rename(path, trash)
+    except OSError:
+        # e.g. trash_dir on another filesystem
+        shutil.rmtree(path)
+        return
+    threading.Thread(target=remove_tree, args=(trash,)).start()
+
+
+def remove_tree(path):
+    """
+    Delete a directory tree, ignoring errors. On POSIX this runs 'rm -rf',
+    whose unlinkat loop in C is much faster than shutil.rmtree on the
+    thousands of files in a clone.
+    """
+    if os.name == "posix":
+        try:
+            subprocess.run(["rm", "-rf", "--", str(path)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return
+        except OSError:
+            pass
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def git_env(repo_url, token=None):
+    """
+    Build the environment for git commands against repo_url.
+    A token is applied through a url.<authenticated>.insteadOf rewrite passed in
+    the environment, so it is never written to the clone's .git/config.
+    """
+    # If token is provided, inject it into the URL for authentication
+    authenticated_url = repo_url
+    if token and token.strip():
+        if repo_url.startswith("https://"):
+            # For GitHub, use token as username in HTTPS URL
+            # Format: https://<token>@github.com/org/repo.git
+            if "github.com" in repo_url:
+                authenticated_url = repo_url.replace("https://", f"https://{token}@")
+            else:
+                # For other Git hosts, use token as username
+                authenticated_url = repo_url.replace("https://", f"https://{token}@")
+        elif repo_url.startswith("git@"):
+            # For SSH URLs, token won't work - use SSH keys instead
+            print(f"Warning: Token authentication not supported for SSH URLs. Using SSH keys.")
+            authenticated_url = repo_url
+    else:
+        # Check if this is a private repository that needs authentication
+        if "github.com" in repo_url and not repo_url.startswith("git@"):
+            print(f"⚠️  Warning: No authentication token provided for {repo_url}")
+            print(f"   If this is a private repository, set MESSAGING_CORE_REPO_TOKEN or VIRTUAL_GOLF_GAME_API_REPO_TOKEN")
+    
+    env = base_git_env()
+    if authenticated_url != repo_url:
+        key = f"url.{authenticated_url}.insteadOf"
+        if git_version() >= CONFIG_ENV_MIN_GIT:
+            index = int(env.get("GIT_CONFIG_COUNT", "0"))
+            env = {
+                **env,
+                f"GIT_CONFIG_KEY_{index}": key,
+                f"GIT_CONFIG_VALUE_{index}": repo_url,
+                "GIT_CONFIG_COUNT": str(index + 1),
+            }
+        else:
+            # Older git ignores GIT_CONFIG_COUNT; GIT_CONFIG_PARAMETERS is where
+            # `git -c key=value` puts its settings, and every git version reads it
+            entry = "'" + f"{key}={repo_url}".replace("'", "'\\''") + "'"
+            existing = env.get("GIT_CONFIG_PARAMETERS")
+            env = {**env, "GIT_CONFIG_PARAMETERS": f"{existing} {entry}" if existing else entry}
+    return env
+
+
+@functools.lru_cache(maxsize=1)
+def base_git_env():
+    """
+    Build the environment shared by every git command once per run.
+    Callers must not modify it; git_env copies it to add credentials.
+    """
+    # Configure Git to not prompt for credentials
+    env = os.environ.copy()
+    env['GIT_TERMINAL_PROMPT'] = '0'
+    env['GIT_ASKPASS'] = 'echo'
+    # Abort stalled transfers (under 1 KB/s for 60s) instead of hanging the run
+    env.setdefault('GIT_HTTP_LOW_SPEED_LIMIT', '1000')
+    env.setdefault('GIT_HTTP_LOW_SPEED_TIME', '60')
+    return env
+
+
+@functools.lru_cache(maxsize=1)
+def git_version():
+    """Return the installed git version as a tuple of ints, (0,) if unknown"""
+    try:
+        result = subprocess.run(
+            ["git", "--version"],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return (0,)
+    match = re.search(rb"(\d+)\.(\d+)", result.stdout)
+    return tuple(int(part) for part in match.groups()) if match else (0,)
+
+
+def apply_sparse_checkout(repo_path, sparse_paths, env):
+    """Limit the working tree of a clone to sparse_paths (None checks out everything)"""
+    if not sparse_paths and git_version() < SPARSE_CHECKOUT_MIN_GIT:
+        # Older git cannot have set up a sparse checkout, so there is nothing to disable
+        return
+    if sparse_paths:
+        cmd = ["git", "sparse-checkout", "set", "--no-cone", *sparse_paths]
+    else:
+        cmd = ["git", "sparse-checkout", "disable"]
+    subprocess.run(
+        cmd,
+        cwd=repo_path,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        env=env
+    )
+
+
+def clone_or_update_repo(repo_url, branch, temp_path, repo_name, token=None, commit_sha=None, sparse_paths=None, use_archive=False, submodule_jobs=None, changed_files=None):
+    """
+    Clone or update a repository, optionally checking out a specific commit.
+    With use_archive, only sparse_paths are downloaded via 'git archive' when the server supports it.
+    With submodule_jobs, submodules are fetched too, that many in parallel.
+    changed_files of commit_sha outside sparse_paths are added to the working tree.
+    """
+    repo_path = temp_path / repo_name
+    env = git_env(repo_url, token)
+    if sparse_paths and git_version() < SPARSE_CHECKOUT_MIN_GIT:
+        sparse_paths = None
+    
+    if use_archive and sparse_paths:
+        archive_path = temp_path / f"{repo_name}.archive"
+        if commit_sha:
+            # The changed files are needed too, wherever they are
+            print(f"Downloading {repo_name} repository at commit {commit_sha[:7]} with git archive...")
+            prefixes = sparse_paths + [f"/{path}" for path in changed_files or ()]
+        else:
+            print(f"Downloading {repo_name} repository with git archive...")
+            prefixes = sparse_paths
+        fetched = fetch_via_archive(repo_url, commit_sha or branch, prefixes, archive_path, token, env)
+        while fetched:
+            # Targets inside the downloaded paths are broken in the commit itself;
+            # others are added to the download (fetch_via_archive drops missing ones)
+            outside = sorted({
+                target for _, target in dangling_symlinks(archive_path)
+                if not matches_sparse_paths(target, prefixes)
+            })
+            if not outside:
+                return archive_path
+            print(f"  ⚠️  Warning: {len(outside)} symlink target(s) outside the downloaded paths, e.g. {outside[0]}")
+            print(f"  → Downloading them too")
+            prefixes = prefixes + [f"/{target}" for target in outside]
+            fetched = fetch_via_archive(repo_url, commit_sha or branch, prefixes, archive_path, token, env)
+        # Do not leave a partial download behind in the cached temp directory
+        if archive_path.exists():
+            discard_dir(archive_path)
+        print(f"  → Falling back to git clone")
+    
+    if commit_sha:
+        print(f"Fetching {repo_name} repository at commit {commit_sha[:7]}...")
+        try:
+            checkout_commit(repo_url, commit_sha, repo_path, sparse_paths, env, submodule_jobs)
+            print(f"  ✅ Checked out commit {commit_sha[:7]}")
+        except subprocess.CalledProcessError as e:
+            error_msg = e.stderr.decode('utf-8', errors='ignore') if e.stderr else ""
+            print(f"  ⚠️  Warning: Failed to checkout commit {commit_sha[:7]}: {error_msg}")
+            print(f"  → Will use latest branch ({branch}) instead")
+            if repo_path.exists():
+                discard_dir(repo_path)
+            clone_repo(repo_url, branch, repo_path, token, sparse_paths, env, submodule_jobs)
+    else:
+        # Standard clone/update behavior for scheduled or manual triggers
+        if repo_path.exists():
+            print(f"Updating {repo_name} repository...")
+            try:
+                # Follow a repository URL changed in config.json since the clone was made
+                subprocess.run(
+                    ["git", "remote", "set-url", "origin", repo_url],
+                    cwd=repo_path,
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    env=env
+                )
+                # Shallow fetch + hard reset: never merges, so it cannot conflict
+                subprocess.run(
+                    ["git", "fetch", "-q", "--depth", "1", "--no-tags", "origin", branch],
+                    cwd=repo_path,
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    env=env
+                )
+                # Pick up pattern changes before checking out the new commit
+                apply_sparse_checkout(repo_path, sparse_paths, env)
+                subprocess.run(
+                    ["git", "reset", "-q", "--hard", "FETCH_HEAD"],
+                    cwd=repo_path,
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    env=env
+                )
+                if submodule_jobs:
+                    update_submodules(repo_path, submodule_jobs, env)
+            except subprocess.CalledProcessError as e:
+                error_msg = e.stderr.decode('utf-8', errors='ignore') if e.stderr else ""
+                print(f"Warning: Failed to update {repo_name} repo: {error_msg}")
+                print(f"Attempting fresh clone...")
+                discard_dir(repo_path)
+                clone_repo(repo_url, branch, repo_path, token, sparse_paths, env, submodule_jobs)
+        else:
+            print(f"Cloning {repo_name} repository...")
+            clone_repo(repo_url, branch, repo_path, token, sparse_paths, env, submodule_jobs)
+    
+    if sparse_paths and widen_sparse_checkout(repo_path, env):
+        sparse_paths = None
+    if commit_sha and sparse_paths and changed_files:
+        checkout_changed_files(repo_path, changed_files, env)
+    return repo_path
+
+
+def dangling_symlinks(root):
+    """
+    List the symlinks under root whose target is a path inside root that does
+    not exist, e.g. one left out of a sparse checkout, as (link, target) pairs
+    relative to root and '/'-separated
+    """
+    real_root = os.path.realpath(root)
+    dangling = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name != ".git"]
+        # Symlinks to missing targets are listed as files by os.walk
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if os.path.islink(path) and not os.path.exists(path):
+                target = os.path.realpath(path)
+                if target.startswith(real_root + os.sep):
+                    dangling.append((
+                        os.path.relpath(path, root).translate(_SLASH_TABLE),
+                        os.path.relpath(target, real_root).translate(_SLASH_TABLE),
+                    ))
+    return dangling
+
+
+def tracked_paths(repo_path, paths, env):
+    """Return the paths (files or directories) that exist in the HEAD commit, via one 'git ls-tree'"""
+    result = subprocess.run(
+        ["git", "--literal-pathspecs", "ls-tree", "-z", "--name-only", "--full-tree", "HEAD", "--", *paths],
+        cwd=repo_path,
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env
+    )
+    # A directory is listed through its entries, so match those against the paths too
+    listed = set()
+    for name in result.stdout.split(b"\0"):
+        name = os.fsdecode(name)
+        while name:
+            listed.add(name)
+            name = name.rpartition("/")[0]
+    return [path for path in paths if path in listed]
+
+
+def widen_sparse_checkout(repo_path, env):
+    """
+    Check out the whole working tree when a symlink in the sparse checkout
+    points at a file left out of it, so the file it links to can be copied.
+    Links that are broken in the commit itself are left alone.
+    Returns True when the sparse checkout was disabled.
+    """
+    dangling = dangling_symlinks(repo_path)
+    if not dangling:
+        return False
+    try:
+        tracked = set(tracked_paths(repo_path, sorted({target for _, target in dangling}), env))
+    except subprocess.CalledProcessError as e:
+        error_msg = e.stderr.decode('utf-8', errors='ignore') if e.stderr else ""
+        print(f"  ⚠️  Warning: Failed to look up symlink targets: {error_msg}")
+        return False
+    dangling = [link for link, target in dangling if target in tracked]
+    if not dangling:
+        return False
+    print(f"  ⚠️  Warning: {len(dangling)} symlink(s) point outside the sparse checkout, e.g. {dangling[0]}")
+    print(f"  → Checking out the full working tree instead")
+    try:
+        apply_sparse_checkout(repo_path, None, env)
+    except subprocess.CalledProcessError as e:
+        error_msg = e.stderr.decode('utf-8', errors='ignore') if e.stderr else ""
+        print(f"  ⚠️  Warning: Failed to disable the sparse checkout: {error_msg}")
+        return False
+    return True
+
+
+def checkout_commit(repo_url, commit_sha, repo_path, sparse_paths, env, submodule_jobs=None):
+    """
+    Check out commit_sha in repo_path, fetching just that commit (shallow, blobs
+    on demand) instead of cloning the branch first. A clone left by an earlier
+    run is reused, so objects it already has are not downloaded again.
+    Raises subprocess.CalledProcessError when a git command fails.
+    """
+    if (repo_path / ".git").is_dir():
+        # Files an earlier run extracted outside the sparse checkout must not linger
+        for entry in os.scandir(repo_path):
+            if entry.name != ".git":
+                # Never into the working tree, where the trash would be copied from
+                discard_dir(Path(entry.path), repo_path.parent)
+        commands = [["git", "remote", "set-url", "origin", repo_url]]
+    else:
+        if repo_path.exists():
+            discard_dir(repo_path)
+        repo_path.mkdir(parents=True)
+        commands = [["git", "init", "-q"], ["git", "remote", "add", "origin", repo_url]]
+    fetch_cmd = ["git", "-c", "protocol.version=2", "fetch", "-q", "--no-tags", "--depth", "1"]
+    if git_version() >= PARTIAL_CLONE_MIN_GIT:
+        # Also registers origin as a promisor remote, as 'git clone --filter' does
+        fetch_cmd.append("--filter=blob:none")
+    commands.append(fetch_cmd + ["origin", commit_sha])
+    for cmd in commands:
+        subprocess.run(
+            cmd,
+            cwd=repo_path,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            env=env
+        )
+    apply_sparse_checkout(repo_path, sparse_paths, env)
+    subprocess.run(
+        ["git", "checkout", "-q", "-f", "FETCH_HEAD"],
+        cwd=repo_path,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        env=env
+    )
+    if submodule_jobs:
+        update_submodules(repo_path, submodule_jobs, env)
+
+
+def sparse_checkout_paths(config, key):
+    """
+    Build sparse-checkout patterns covering every file the config may copy.
+    commit_only patterns are left out: changed files outside these paths are
+    extracted separately (see checkout_changed_files).
+    Returns None when the whole working tree is needed.
+    """
+    paths = []
+    for pattern_config in config.get(f"{key}_patterns") or []:
+        if pattern_config.get("commit_only"):
+            continue
+        source = pattern_config.get("source", "").translate(_SLASH_TABLE).lstrip("/")
+        wildcard = min((source.find(c) for c in "*?[" if c in source), default=-1)
+        if wildcard == -1:
+            # Plain file or directory path
+            paths.append(f"/{source}")
+            continue
+        # Keep the directory part in front of the first wildcard
+        base_dir = source[:source.rfind("/", 0, wildcard) + 1]
+        if base_dir:
+            paths.append(f"/{base_dir}")
+        elif "/" not in source and not pattern_config.get("recursive", False):
+            # Root-level glob such as *.yml
+            paths.append(f"/{source}")
+        else:
+            # Wildcard in the top-level directory, e.g. **/*
+            return None
+    for source in config.get(f"{key}_paths") or {}:
+        paths.append("/" + source.translate(_SLASH_TABLE).lstrip("/"))
+    return list(dict.fromkeys(paths)) or None
+
+
+def parse_changed_files(changed_files_list):
+    """Split the comma-separated TRIGGER_CHANGED_FILES value into normalized paths"""
+    if not changed_files_list:
+        return []
+    return [f.strip().translate(_SLASH_TABLE) for f in changed_files_list.split(",") if f.strip()]
+
+
+def checkout_changed_files(repo_path, changed_files, env):
+    """
+    Write changed files that the sparse checkout left out (e.g. ones only
+    commit_only patterns match) into the working tree, streaming every blob
+    through a single 'git cat-file --batch' process
+    """
+    missing = [path for path in changed_files if not (repo_path / path).exists()]
+    if not missing:
+        return
+    try:
+        # Trees are already local in a blob:none clone, so this needs no network
+        result = subprocess.run(
+            ["git", "--literal-pathspecs", "ls-tree", "-z", "--full-tree", "HEAD", "--", *missing],
+            cwd=repo_path,
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env
+        )
+        blobs = []
+        for record in result.stdout.split(b"\0"):
+            info, _, path = record.partition(b"\t")
+            if not path:
+                continue
+            mode, object_type, oid = info.split()
+            # Symlinks and submodules are not copied as documents
+            if object_type == b"blob" and mode != b"120000":
+                blobs.append((oid, os.fsdecode(path), mode == b"100755"))
+        if not blobs:
+            return
+        
+        # Fetch the missing blobs in one request, the way git's own lazy fetch
+        # does, instead of letting cat-file fetch them one at a time
+        subprocess.run(
+            ["git", "-c", "fetch.negotiationAlgorithm=noop", "fetch", "-q", "--no-tags", "--no-write-fetch-head", "--recurse-submodules=no",
+             "--filter=blob:none", "--stdin", "origin"],
+            cwd=repo_path,
+            input=b"".join(oid + b"\n" for oid, _, _ in blobs),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=env
+        )
+        
+        with subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=repo_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env
+        ) as proc:
+            created_dirs = set()
+            for oid, path, executable in blobs:
+                proc.stdin.write(oid + b"\n")
+                proc.stdin.flush()
+                # Each reply is "<oid> <type> <size>", the contents and a newline
+                header = proc.stdout.readline().split()
+                if len(header) != 3:
+                    continue
+                remaining = int(header[2])
+                dest_file = repo_path / path
+                if dest_file.parent not in created_dirs:
+                    dest_file.parent.mkdir(parents=True, exist_ok=True)
+                    created_dirs.add(dest_file.parent)
+                with open(dest_file, "wb") as f:
+                    while remaining:
+                        chunk = proc.stdout.read(min(remaining, 1 << 20))
+                        if not chunk:
+                            raise OSError(f"git cat-file ended while reading {path}")
+                        f.write(chunk)
+                        remaining -= len(chunk)
+                proc.stdout.read(1)
+                if executable:
+                    os.chmod(dest_file, 0o755)
+            proc.stdin.close()
+    except (subprocess.CalledProcessError, OSError) as e:
+        print(f"  ⚠️  Warning: Could not extract changed files outside the sparse checkout: {e}")
+
+
+def update_submodules(repo_path, jobs, env):
+    """Check out the submodules of repo_path at the recorded commits, fetching jobs of them in parallel"""
+    subprocess.run(
+        ["git", "submodule", "update", "-q", "--init", "--recursive", "--depth", "1", "--jobs", str(jobs)],
+        cwd=repo_path,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        env=env
+    )
+
+
+def checkout_branch(branch, repo_path, env, submodule_jobs=None):
+    """Check out branch in a clone made with --no-checkout"""
+    subprocess.run(
+        ["git", "checkout", "-q", branch],
+        cwd=repo_path,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        env=env
+    )
+    if submodule_jobs:
+        # --recurse-submodules has nothing to do with --no-checkout
+        update_submodules(repo_path, submodule_jobs, env)
+
+
+def clone_repo(repo_url, branch, target_path, token=None, sparse_paths=None, env=None, submodule_jobs=None):
+    """
+    Clone a repository to a specific path.
+    Uses a shallow partial clone; with sparse_paths only those paths are checked out.
+    With submodule_jobs, submodules are cloned too (shallow, that many in parallel).
+    """
+    if env is None:
+        env = git_env(repo_url, token)
+    try:
+        clone_cmd = [
+            "git", "-c", "protocol.version=2", "clone", "-q",
+            "--no-tags", "--single-branch", "--depth", "1",
+            "-b", branch,
+        ]
+        if git_version() >= PARTIAL_CLONE_MIN_GIT:
+            # Blobs are fetched on demand, so only files that get checked out are downloaded
+            clone_cmd.append("--filter=blob:none")
+        if sparse_paths:
+            clone_cmd.append("--no-checkout")
+        elif submodule_jobs:
+            clone_cmd += ["--recurse-submodules", "--shallow-submodules", "--jobs", str(submodule_jobs)]
+        subprocess.run(
+            clone_cmd + [repo_url, str(target_path)],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            env=env
+        )
+        if sparse_paths:
+            apply_sparse_checkout(target_path, sparse_paths, env)
+            checkout_branch(branch, target_path, env, submodule_jobs)
+        print(f"  ✅ Successfully cloned {repo_url}")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Error: Failed to clone repository {repo_url}")
+        error_msg = e.stderr.decode('utf-8', errors='ignore') if e.stderr else ""
+        print(f"Error details: {error_msg}")
+        
+        # Check for specific authentication errors
+        error_lower = error_msg.lower()
+        if "could not read username" in error_lower or "authentication" in error_lower or "permission" in error_lower or "credential" in error_lower:
+            print("\n🔐 Authentication Error Detected")
+            print("💡 Solution: Add GitHub Personal Access Token as repository secret")
+            print("\n   For messaging-core repository:")
+            print("   - Secret name: MESSAGING_CORE_REPO_TOKEN")
+            print("   - Token scopes needed: 'repo' (for private repos)")
+            print("\n   For virtual-golf-game-api repository:")
+            print("   - Secret name: VIRTUAL_GOLF_GAME_API_REPO_TOKEN")
+            print("   - Token scopes needed: 'repo' (for private repos)")
+            print("\n   Steps:")
+            print("   1. Create token: GitHub → Settings → Developer settings → Personal access tokens")
+            print("   2. Add token to central documentation repo → Settings → Secrets → Actions")
+            print("   3. Make sure token has 'repo' scope if repositories are private")
+        
+        sys.exit(1)
+
+
+def matches_sparse_paths(path, sparse_paths):
+    """Check a repository-relative path against sparse-checkout paths from sparse_checkout_paths"""
+    for sparse_path in sparse_paths:
+        sparse_path = sparse_path.lstrip("/")
+        if sparse_path.endswith("/"):
+            if path.startswith(sparse_path):
+                return True
+        elif any(c in sparse_path for c in "*?["):
+            # Root-level glob: only matches files directly in the root
+            if "/" not in path and fnmatch.fnmatch(path, sparse_path):
+                return True
+        elif path == sparse_path or path.startswith(sparse_path + "/"):
+            return True
+    return False
+
+
+def fetch_via_archive(repo_url, ref, prefixes, dest_dir, token=None, env=None):
+    """
+    Stream the files under the given sparse-checkout paths of a branch or
+    commit from 'git archive --remote' straight into dest_dir, without a
+    clone or .git directory.
+    Returns False if the server refuses (GitHub does not support it over HTTPS),
+    so the caller can fall back to cloning.
+    """
+    if env is None:
+        env = git_env(repo_url, token)
+    
+    # Sparse paths are anchored at the repository root, pathspecs are relative to it
+    archive_pathspecs = [f":(glob){prefix.lstrip('/')}" for prefix in prefixes]
+    while True:
+        if dest_dir.exists():
+            discard_dir(dest_dir)
+        dest_dir.mkdir(parents=True)
+        
+        proc = subprocess.Popen(
+            ["git", "archive", "--format=tar.gz", f"--remote={repo_url}", ref, "--", *archive_pathspecs],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env
+        )
+        extracted = 0
+        try:
+            with tarfile.open(fileobj=proc.stdout, mode="r|gz") as tar:
+                for member in tar:
+                    # Symlinks too, so a link to a file outside prefixes can be detected
+                    if not (member.isfile() or member.issym()) or not matches_sparse_paths(member.name, prefixes):
+                        continue
+                    if hasattr(tarfile, "data_filter"):
+                        try:
+                            tar.extract(member, dest_dir, filter="data")
+                        except tarfile.FilterError as e:
+                            # e.g. a symlink leaving the repository
+                            print(f"  [SKIP] {member.name}: {e}")
+                            continue
+                    else:
+                        tar.extract(member, dest_dir)
+                    extracted += 1
+        except tarfile.TarError:
+            pass
+        finally:
+            proc.stdout.close()
+            error_msg = proc.stderr.read().decode('utf-8', errors='ignore').strip()
+            proc.stderr.close()
+            returncode = proc.wait()
+        
+        if returncode == 0:
+            print(f"  ✅ Extracted {extracted} file(s) from {repo_url}")
+            return True
+        # git archive fails if any pathspec matches nothing (e.g. a deleted
+        # file): drop that one and retry, or fetch the whole tree if unsure which
+        unmatched = re.search(r"pathspec '(.*?)' did not match", error_msg)
+        if not unmatched or not archive_pathspecs:
+            break
+        remaining = [spec for spec in archive_pathspecs if spec != unmatched.group(1)]
+        archive_pathspecs = remaining if len(remaining) < len(archive_pathspecs) and remaining else []
+    
+    print(f"  ⚠️  Warning: git archive failed: {error_msg}")
+    return False
+
+
+@functools.lru_cache(maxsize=None)
+def compile_exclude_patterns(exclude_patterns):
+    """Combine a tuple of exclude glob patterns into one compiled regex (None if empty)"""
+    if not exclude_patterns:
+        return None
+    return re.compile("|".join(
+        f"(?:{fnmatch.translate(os.path.normcase(pattern))})" for pattern in exclude_patterns
+    ))
+
+
+def exclude_regex(exclude_patterns):
+    """Return the compiled regex for exclude_patterns, which may already be one"""
+    if exclude_patterns is None or isinstance(exclude_patterns, re.Pattern):
+        return exclude_patterns
+    return compile_exclude_patterns(tuple(exclude_patterns))
+
+
+def should_exclude_file(file_path, exclude_patterns):
+    """
+    Check if a file should be excluded based on patterns.
+    exclude_patterns may be a list of globs or a regex from compile_exclude_patterns.
+    """
+    file_path_str = str(file_path)
+    return is_excluded(os.path.basename(file_path_str), file_path_str, exclude_regex(exclude_patterns))
+
+
+def is_excluded(name, path, exclude_re):
+    """Match a file name and path (plain strings) against a compiled exclude regex"""
+    if exclude_re is None:
+        return False
+    return bool(
+        exclude_re.match(os.path.normcase(name))
+        or exclude_re.match(os.path.normcase(path))
+    )
+
+
+def ensure_dirs(dirs):
+    """Create destination directories, skipping ones already created this run"""
+    for dest_dir in dirs:
+        if dest_dir not in _created_dirs:
+            dest_dir.mkdir(parents=True, exist_ok=True)
+            _created_dirs.add(dest_dir)
+
+
+def fast_copy(source_file, dest_file, hardlink=True):
+    """
+    Hardlink source_file to dest_file, falling back to a regular copy when
+    linking is disabled or not possible (e.g. across filesystems).
+    Returns False without touching dest_file when an earlier run left it
+    up to date: a hardlink to source_file, or a copy with the same size,
+    mtime and contents. Nothing written this run is skipped, so when several
+    sources map to one destination the last one wins.
+    """
+    dest_key = os.fspath(dest_file)
+    try:
+        dest_stat = os.stat(dest_file, follow_symlinks=False)
+    except FileNotFoundError:
+        dest_stat = None
+    if dest_stat is not None:
+        if dest_key not in _written_dests:
+            source_stat = os.stat(source_file)
+            if (source_stat.st_dev, source_stat.st_ino) == (dest_stat.st_dev, dest_stat.st_ino):
+                return False
+            if (
+                source_stat.st_size == dest_stat.st_size
+                and source_stat.st_mtime_ns == dest_stat.st_mtime_ns
+                and filecmp.cmp(source_file, dest_file, shallow=False)
+            ):
+                return False
+        os.unlink(dest_file)
+    _written_dests.add(dest_key)
+    if hardlink:
+        try:
+            # Link the file itself: os.link on a symlink would copy the (relative) link
+            os.link(os.path.realpath(source_file), dest_file)
+            return True
+        except OSError:
+            pass
+    copy_file_data(source_file, dest_file)
+    return True
+
+
+def copy_file_data(source_file, dest_file):
+    """
+    Copy file contents inside the kernel (copy_file_range, else sendfile, else
+    a 1 MiB buffer loop), then the metadata like shutil.copy2 does.
+    Other platforms use shutil.copy2.
+    """
+    if not sys.platform.startswith("linux"):
+        shutil.copy2(source_file, dest_file)
+        return
+    
+    src_fd = os.open(source_file, os.O_RDONLY | os.O_CLOEXEC)
+    try:
+        size = os.fstat(src_fd).st_size
+        dst_fd = os.open(dest_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o644)
+        try:
+            copy_fd_data(src_fd, dst_fd, size)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    shutil.copystat(source_file, dest_file)
+
+
+def copy_fd_data(src_fd, dst_fd, size):
+    """
+    Copy the first size bytes of src_fd to the current position of dst_fd
+    (copy_file_range, else sendfile, else a 1 MiB buffer loop).
+    """
+    copied = 0
+    try:
+        # Lets the filesystem reflink or copy server-side where supported
+        while copied < size:
+            sent = os.copy_file_range(src_fd, dst_fd, size - copied, copied)
+            if sent == 0:
+                break
+            copied += sent
+    except (AttributeError, OSError):
+        try:
+            while copied < size:
+                sent = os.sendfile(dst_fd, src_fd, copied, size - copied)
+                if sent == 0:
+                    break
+                copied += sent
+        except (AttributeError, OSError):
+            copy_fd_buffered(src_fd, dst_fd, copied)
+
+
+def copy_fd_buffered(src_fd, dst_fd, offset=0):
+    """Copy the rest of src_fd from offset to the current position of dst_fd through one reusable 1 MiB buffer"""
+    os.lseek(src_fd, offset, os.SEEK_SET)
+    buffer = memoryview(bytearray(1 << 20))
+    with open(src_fd, "rb", buffering=0, closefd=False) as src:
+        while True:
+            count = src.readinto(buffer)
+            if not count:
+                break
+            written = 0
+            while written < count:
+                written += os.write(dst_fd, buffer[written:count])
+
+
+def compile_name_pattern(name_pattern):
+    """
+    Compile a file name pattern (nested ones such as api/*.md too) into one regex
+    per path component. A ** component becomes None and matches any number of
+    components, as it does for Path.rglob; a trailing one matches every file below.
+    """
+    parts = name_pattern.split("/")
+    if len(parts) > 1 and parts[-1] == "**":
+        parts.append("*")
+    return tuple(
+        None if part == "**" else re.compile(fnmatch.translate(os.path.normcase(part)))
+        for part in parts
+    )
+
+
+def match_name_parts(parts, name_regexes):
+    """Check whether the trailing path components in parts match the regexes from compile_name_pattern"""
+    if None not in name_regexes:
+        return len(parts) >= len(name_regexes) and all(
+            regex.match(os.path.normcase(part))
+            for part, regex in zip(parts[-len(name_regexes):], name_regexes)
+        )
+    # Track every position the pattern can have consumed parts up to; the
+    # leading None lets the match start at any depth below base_dir
+    positions = {0}
+    for regex in (None,) + name_regexes:
+        if regex is None:
+            positions = set(range(min(positions), len(parts) + 1))
+        else:
+            positions = {
+                position + 1 for position in positions
+                if position < len(parts) and regex.match(os.path.normcase(parts[position]))
+            }
+        if not positions:
+            return False
+    return len(parts) in positions
+
+
+def walk_pattern_matches(root, searches, exclude_patterns):
+    """
+    Find the files for several patterns in a single os.scandir walk of root.
+    searches is a list of (base_dir, name_regexes, recursive) with base_dir
+    relative to root ("" for root itself). Returns one list of file paths (as
+    strings) per search, ordered as a separate walk of each base_dir would be.
+    Excluded directories (and .git) below a base_dir are pruned.
+    """
+    root = str(root)
+    exclude_patterns = exclude_regex(exclude_patterns)
+    bases = [os.path.normpath(base_dir or ".") for base_dir, _, _ in searches]
+    bases = ["" if base_dir == os.curdir else base_dir for base_dir in bases]
+    starts = {}
+    for index, base_dir in enumerate(bases):
+        starts.setdefault(base_dir, []).append(index)
+    # Directories leading to a base_dir are entered even if they would be excluded
+    ancestors = set()
+    for base_dir in starts:
+        while base_dir:
+            base_dir = os.path.dirname(base_dir)
+            ancestors.add(base_dir)
+    
+    results = [[] for _ in searches]
+    # Each entry carries the recursive searches that reached it from a parent
+    stack = [(root, "", ())]
+    while stack:
+        dir_path, dir_rel, inherited = stack.pop()
+        active = inherited + tuple(starts.get(dir_rel, ()))
+        carried = tuple(index for index in active if searches[index][2])
+        subdirs = []
+        try:
+            with os.scandir(dir_path) as entries:
+                # is_dir/is_symlink come from the cached d_type, so most files are
+                # handled without a stat call or building their relative path
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        entry_rel = f"{dir_rel}{os.sep}{entry.name}" if dir_rel else entry.name
+                        if carried and entry.name != ".git" and not is_excluded(entry.name, entry.path, exclude_patterns):
+                            subdirs.append((entry.path, entry_rel, carried))
+                        elif entry_rel in starts or entry_rel in ancestors:
+                            subdirs.append((entry.path, entry_rel, ()))
+                        continue
+                    if entry.is_symlink():
+                        entry_rel = f"{dir_rel}{os.sep}{entry.name}" if dir_rel else entry.name
+                        if (entry_rel in starts or entry_rel in ancestors) and entry.is_dir():
+                            # Symlinks are only followed on the way to a base_dir
+                            subdirs.append((entry.path, entry_rel, ()))
+                            continue
+                    if not active:
+                        continue
+                    name = os.path.normcase(entry.name)
+                    matched = []
+                    for index in active:
+                        name_regexes = searches[index][1]
+                        if len(name_regexes) > 1:
+                            # Nested patterns match the trailing components below base_dir
+                            base_dir = bases[index]
+                            entry_rel = f"{dir_rel}{os.sep}{entry.name}" if dir_rel else entry.name
+                            parts = (entry_rel[len(base_dir) + 1:] if base_dir else entry_rel).split(os.sep)
+                            if match_name_parts(parts, name_regexes):
+                                matched.append(index)
+                        elif name_regexes[0].match(name):
+                            matched.append(index)
+                    if matched and entry.is_file() and not is_excluded(entry.name, entry.path, exclude_patterns):
+                        for index in matched:
+                            results[index].append(entry.path)
+        except OSError:
+            continue
+        # Visit subdirectories in listing order, depth first
+        stack.extend(reversed(subdirs))
+    return results
+
+
+def is_yaml_file(file_path):
+    """Return True for YAML files (Path or str)."""
+    suffix = os.path.splitext(file_path)[1].lower()
+    return suffix in {".yml", ".yaml"}
+
+
+def remove_raw_yaml(root):
+    """
+    Delete the YAML files under root in one os.scandir walk (symlinked
+    directories are not followed); returns how many were removed
+    """
+    removed = 0
+    stack = [str(root)]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            # The name is checked first, so only YAML files cost a stat
+            if is_yaml_file(entry.name):
+                if entry.is_file():
+                    try:
+                        os.unlink(entry.path)
+                        removed += 1
+                    except OSError as e:
+                        print(f"[WARNING] Failed to remove {entry.path}: {e}")
+                        continue
+                    continue
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+    return removed
+
+
+def write_yaml_markdown(source_file, dest_md, relative_source):
+    """
+    Create a readable Markdown wrapper for YAML content.
+    Returns "copied", "unchanged" (the wrapper is already up to date) or "failed".
+    """
+    source_file = Path(source_file)
+    dest_key = os.fspath(dest_md)
+    # The YAML is streamed into the fence as is; only the header and footer
+    # are encoded here, with the platform line endings write_text would produce
+    header = (
+        f"# {source_file.name}\n\n"
+        f"Source: `{relative_source}`\n\n"
+        "```yaml\n"
+    ).replace("\n", os.linesep).encode("utf-8")
+    footer = "\n```\n".replace("\n", os.linesep).encode("utf-8")
+    try:
+        dest_stat = os.stat(dest_md)
+    except OSError:
+        dest_stat = None
+    try:
+        source_stat = os.stat(source_file)
+        source_mtime = source_stat.st_mtime_ns
+        # Wrappers are stamped with the mtime of the YAML they were rendered
+        # from; the size rules out another YAML file with the same mtime
+        if (
+            dest_stat is not None
+            and dest_key not in _written_dests
+            and dest_stat.st_nlink == 1
+            and dest_stat.st_mtime_ns == source_mtime
+            and dest_stat.st_size == len(header) + source_stat.st_size + len(footer)
+        ):
+            return "unchanged"
+        src_fd = os.open(source_file, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    except OSError as e:
+        print(f"  [ERROR] Failed to read {relative_source}: {e}")
+        return "failed"
+
+    _written_dests.add(dest_key)
+    try:
+        size = os.fstat(src_fd).st_size
+        body = None
+        if not decodes_as_utf8(src_fd):
+            # mkdocs reads pages as strict UTF-8, so drop the invalid bytes
+            # as rendering through a decoded string always did
+            text = source_file.read_text(encoding="utf-8", errors="ignore")
+            body = text.replace("\n", os.linesep).encode("utf-8")
+            size = len(body)
+        # An identical wrapper (e.g. in a fresh checkout of docs/) is only re-stamped
+        # A wrapper is never written with more than one link, so anything else
+        # at dest_md (e.g. a file hardlinked from a clone) is replaced
+        written = (
+            dest_stat is None
+            or dest_stat.st_nlink > 1
+            or dest_stat.st_size != len(header) + size + len(footer)
+            or not wrapper_matches(dest_md, header, src_fd, footer, body)
+        )
+        if written:
+            if dest_stat is not None:
+                # Unlink rather than truncate, which would write through a hardlink
+                os.unlink(dest_md)
+            fd = os.open(dest_md, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+            try:
+                # A body of None is streamed from the source
+                for data in (header, body, footer):
+                    if data is None:
+                        copy_fd_data(src_fd, fd, size)
+                        continue
+                    view = memoryview(data)
+                    while view:
+                        view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
+        os.utime(dest_md, ns=(source_mtime, source_mtime))
+        return "copied" if written else "unchanged"
+    except OSError as e:
+        print(f"  [ERROR] Failed to write {dest_md}: {e}")
+        return "failed"
+    finally:
+        os.close(src_fd)
+
+
+def decodes_as_utf8(src_fd):
+    """Check that a file is valid UTF-8, decoding it 1 MiB at a time"""
+    os.lseek(src_fd, 0, os.SEEK_SET)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(src_fd, "rb", closefd=False) as src:
+        try:
+            while True:
+                chunk = src.read(1 << 20)
+                decoder.decode(chunk, final=not chunk)
+                if not chunk:
+                    return True
+        except UnicodeDecodeError:
+            return False
+
+
+def wrapper_matches(dest_md, header, src_fd, footer, body=None):
+    """
+    Compare an existing YAML wrapper with header + body + footer; without
+    a body the source is compared instead, 1 MiB at a time
+    """
+    os.lseek(src_fd, 0, os.SEEK_SET)
+    with open(dest_md, "rb") as dest, open(src_fd, "rb", closefd=False) as src:
+        if dest.read(len(header)) != header:
+            return False
+        if body is not None:
+            return dest.read() == body + footer
+        while True:
+            chunk = src.read(1 << 20)
+            if not chunk:
+                return dest.read() == footer
+            if dest.read(len(chunk)) != chunk:
+                return False
+
+
+@functools.lru_cache(maxsize=None)
+def compile_source_pattern(source_pattern):
+    """
+    Compile a pattern's source into one regex, to match against the
+    os.path.normcase'd '/'-separated path of a file (as fnmatch does)
+    """
+    source_pattern = source_pattern.translate(_SLASH_TABLE)
+    
+    def translate(pattern):
+        return fnmatch.translate(os.path.normcase(pattern))
+    
+    # Handle glob patterns
+    if "*" in source_pattern or "?" in source_pattern:
+        pattern_parts = source_pattern.split("**")
+        if len(pattern_parts) == 2:
+            # docs/**/*.md should match docs/any/path/file.md
+            prefix = pattern_parts[0].rstrip("/")
+            suffix = pattern_parts[1].lstrip("/")
+            if not prefix:
+                # **/*.md - match any file with that extension (a match on the
+                # file name alone is covered by the leading *)
+                return re.compile(translate(f"*{suffix}"))
+            # docs/**/*.md - match docs/.../*.md: the prefix (a plain string
+            # prefix), every following separator, then the suffix at any depth
+            sep = re.escape(os.path.normcase("/"))
+            return re.compile(
+                f"{re.escape(os.path.normcase(prefix))}{sep}*(?!{sep})"
+                f"(?:{translate(suffix)}|{translate(f'*/{suffix}')})"
+            )
+        if len(pattern_parts) > 2:
+            # Multiple **, use simpler matching
+            return re.compile(translate(source_pattern.replace("**", "*")))
+        # Simple glob pattern (no **)
+        return re.compile(translate(source_pattern))
+    
+    # Exact match on the path, or on the file name for patterns without a '/'
+    sep = re.escape(os.path.normcase("/"))
+    exact = re.escape(os.path.normcase(source_pattern))
+    alternatives = [f"{exact}\\Z" if "/" in source_pattern else f"(?:.*{sep})?{exact}\\Z"]
+    # Also check if it's a directory pattern match
+    if source_pattern.endswith("/"):
+        alternatives.append(re.escape(os.path.normcase(source_pattern.rstrip("/"))))
+    return re.compile(f"(?s:{'|'.join(alternatives)})")
+
+
+@functools.lru_cache(maxsize=None)
+def compile_source_patterns(source_patterns):
+    """
+    Index a tuple of pattern sources for find_source_pattern: exact file
+    patterns go in dicts keyed by path (or by file name for patterns without
+    a '/'), the rest in one regex with a named group per pattern (p0, p1, ...)
+    """
+    paths = {}
+    names = {}
+    globs = []
+    for index, source in enumerate(source_patterns):
+        source = source.translate(_SLASH_TABLE)
+        if "*" in source or "?" in source or source.endswith("/"):
+            globs.append(f"(?P<p{index}>{compile_source_pattern(source).pattern})")
+        else:
+            # Keep the first pattern for each key, as the regex alternation would
+            exact = paths if "/" in source else names
+            exact.setdefault(os.path.normcase(source), index)
+    return paths, names, re.compile("|".join(globs)) if globs else None
+
+
+def find_source_pattern(source_patterns, path):
+    """
+    Return the index of the first pattern source matching path (os.path.normcase'd
+    and '/'-separated, as for compile_source_pattern), or None
+    """
+    paths, names, globs_re = compile_source_patterns(source_patterns)
+    candidates = [
+        paths.get(path),
+        names.get(path.rpartition(os.path.normcase("/"))[2]),
+    ]
+    if globs_re is not None:
+        # lastgroup of a match names the first matching glob pattern
+        match = globs_re.match(path)
+        if match:
+            candidates.append(int(match.lastgroup[1:]))
+    return min((index for index in candidates if index is not None), default=None)
+
+
+def copy_file(source_file, dest_file, relative_path, hardlink=True):
+    """
+    Copy a single file into docs/, rendering YAML to Markdown.
+    Returns "copied", "unchanged" (dest_file already up to date) or "failed".
+    """
+    if is_yaml_file(source_file):
+        return write_yaml_markdown(source_file, dest_file, relative_path)
+    return "copied" if fast_copy(source_file, dest_file, hardlink) else "unchanged"
+
+
+def copy_planned_files(planned_copies, hardlink=True):
+    """
+    Run (source_file, relative_path, dest_file) copies on a thread pool.
+    Copies sharing a destination run in order on the same worker, so the last one wins.
+    Returns a (status, error) tuple for each planned copy, in order, with
+    status as returned by copy_file.
+    """
+    # Create each destination directory once, before any worker starts
+    ensure_dirs({dest_file.parent for _, _, dest_file in planned_copies})
+    
+    by_dest = {}
+    for index, (_, _, dest_file) in enumerate(planned_copies):
+        by_dest.setdefault(dest_file, []).append(index)
+    
+    results = [None] * len(planned_copies)
+    
+    def run(batch):
+        for indexes in batch:
+            for index in indexes:
+                source_file, relative_path, dest_file = planned_copies[index]
+                try:
+                    results[index] = (copy_file(source_file, dest_file, relative_path, hardlink), None)
+                except Exception as e:
+                    results[index] = ("failed", e)
+    
+    if by_dest:
+        # File I/O releases the GIL, so copies overlap in the kernel
+        workers = min(32, (os.cpu_count() or 1) * 4, len(by_dest))
+        # Hand each worker one batch of destinations rather than one task per
+        # destination, keeping the pool's per-task overhead off the per-file path
+        groups = list(by_dest.values())
+        batches = [groups[start::workers] for start in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Copy the context so anything printed lands in the caller's output buffer
+            futures = [pool.submit(contextvars.copy_context().run, run, batch) for batch in batches]
+            for future in futures:
+                future.result()
+    return results
+
+
+def copy_and_report(planned_copies, hardlink=True):
+    """
+    Copy planned (source_file, relative_path, dest_file) files with copy_planned_files
+    and log the outcome of each in a single write; returns the count copied or unchanged
+    """
+    results = copy_planned_files(planned_copies, hardlink)
+    copied_count = 0
+    lines = []
+    for (source_file, relative_path, dest_file), (status, error) in zip(planned_copies, results):
+        if error:
+            lines.append(f"  [ERROR] Failed to copy {relative_path}: {error}")
+        elif status == "copied":
+            action = "Rendered" if is_yaml_file(source_file) else "Copied"
+            lines.append(f"  [OK] {action} {relative_path} -> {dest_file.relative_to(DOCS_PATH)}")
+            copied_count += 1
+        elif status == "unchanged":
+            lines.append(f"  [SKIP] Unchanged {relative_path} -> {dest_file.relative_to(DOCS_PATH)}")
+            copied_count += 1
+    if lines:
+        print("\n".join(lines))
+    return copied_count
+
+
+def copy_changed_files(source_repo_path, changed_files_list, patterns, exclude_patterns, repo_name, hardlink=True):
+    """Copy only the changed files that match the patterns"""
+    if not changed_files_list:
+        print("  [INFO] No changed files list provided")
+        return 0
+    
+    # Parse changed files (comma-separated)
+    changed_files = [f.strip() for f in changed_files_list.split(",") if f.strip()]
+    
+    if not changed_files:
+        print("  [INFO] No changed files to process")
+        return 0
+    
+    print(f"  Processing {len(changed_files)} changed file(s)...")
+    
+    copied_count = 0
+    matched_files = []
+    # Exact patterns are looked up by path or file name, the rest share one regex
+    source_patterns = tuple(pattern_config.get("source") for pattern_config in patterns)
+    exclude_re = exclude_regex(exclude_patterns)
+    
+    # Find which changed files match our patterns
+    for changed_file in changed_files:
+        # Normalize path (handle both Windows and Unix paths)
+        changed_file_normalized = changed_file.translate(_SLASH_TABLE)
+        file_path = source_repo_path / changed_file_normalized
+        
+        # Check if file exists (might have been deleted)
+        if not file_path.exists():
+            print(f"  [INFO] File no longer exists (deleted?): {changed_file}")
+            # TODO: Could delete from destination if needed
+            continue
+        
+        # Get relative path for pattern matching (relative to repo root)
+        try:
+            relative_path = file_path.relative_to(source_repo_path)
+        except ValueError:
+            # If path is not relative, try to make it relative
+            relative_path = Path(changed_file_normalized)
+        
+        # Check if file matches any pattern
+        if should_exclude_file(relative_path, exclude_re):
+            continue
+        index = find_source_pattern(source_patterns, os.path.normcase(str(relative_path).translate(_SLASH_TABLE)))
+        if index is not None:
+            pattern_config = patterns[index]
+            matched_files.append((file_path, pattern_config.get("destination", ""), changed_file_normalized))
+    
+    # Work out every destination first, then copy them all on the thread pool
+    planned_copies = []
+    for source_file, dest_base, relative_path in matched_files:
+        # Determine destination path
+        if dest_base.endswith("/") or dest_base == "":
+            # Destination is a directory, preserve relative path structure
+            dest_file = DOCS_PATH / dest_base / relative_path
+        else:
+            # Destination is a specific file path
+            dest_file = DOCS_PATH / dest_base
+        
+        # YAML is rendered to a Markdown wrapper instead of copied raw
+        if is_yaml_file(source_file):
+            dest_file = dest_file.with_suffix(dest_file.suffix + ".md")
+        planned_copies.append((source_file, relative_path, dest_file))
+    
+    copied_count += copy_and_report(planned_copies, hardlink)
+    
+    if not matched_files:
+        print(f"  [INFO] No changed files matched the configured patterns")
+        print(f"  Changed files: {', '.join(changed_files[:5])}{'...' if len(changed_files) > 5 else ''}")
+    
+    return copied_count
+
+
+def copy_files_by_pattern(source_repo_path, patterns, exclude_patterns, repo_name, hardlink=True):
+    """Copy files from source repository using glob patterns"""
+    copied_count = 0
+    exclude_re = exclude_regex(exclude_patterns)
+    root_prefix_len = len(os.path.join(str(source_repo_path), ""))
+    
+    # Resolve every pattern first so a single walk of the repository can serve them all
+    resolved = []
+    searches = []
+    for pattern_config in patterns:
+        if pattern_config.get("commit_only"):
+            continue
+        source_pattern = pattern_config.get("source")
+        
+        # Convert glob pattern to Path pattern
+        source_path_obj = source_repo_path / source_pattern
+        
+        # Find all matching files
+        is_glob = "*" in source_pattern or "?" in source_pattern
+        missing_dir = None
+        matching_files = None
+        if is_glob:
+            # Use glob pattern matching
+            if "**" in source_pattern:
+                # Handle recursive patterns without treating '**' as a real folder
+                prefix, _, suffix = source_pattern.partition("**")
+                base_dir = prefix.rstrip("/")
+                pattern_name = suffix.lstrip("/") or "*"
+                recursive = True
+            else:
+                base_dir = str(source_path_obj.parent.relative_to(source_repo_path))
+                pattern_name = source_path_obj.name
+                recursive = pattern_config.get("recursive", False)
+            parent_dir = source_repo_path / base_dir if base_dir else source_repo_path
+            if parent_dir.exists():
+                matching_files = len(searches)
+                searches.append((base_dir, compile_name_pattern(pattern_name), recursive))
+            else:
+                missing_dir = parent_dir
+        else:
+            # Single file or directory
+            matching_files = []
+            if source_path_obj.is_file():
+                if not should_exclude_file(source_path_obj, exclude_re):
+                    matching_files = [str(source_path_obj)]
+            elif source_path_obj.is_dir():
+                matching_files = len(searches)
+                searches.append((source_pattern, compile_name_pattern("*"), True))
+        resolved.append((pattern_config, source_path_obj, is_glob, missing_dir, matching_files))
+    
+    walk_results = walk_pattern_matches(source_repo_path, searches, exclude_re) if searches else []
+    
+    for pattern_config, source_path_obj, is_glob, missing_dir, matching_files in resolved:
+        source_pattern = pattern_config.get("source")
+        dest_base = pattern_config.get("destination", "")
+        description = pattern_config.get("description", "")
+        
+        if description:
+            print(f"  Pattern: {description}")
+        
+        if missing_dir is not None:
+            print(f"  [WARNING] Source directory does not exist: {missing_dir.relative_to(source_repo_path)}")
+            continue
+        if isinstance(matching_files, int):
+            matching_files = walk_results[matching_files]
+        
+        # Determine the destination layout once; it is the same for every file
+        dest_path = DOCS_PATH / dest_base
+        if dest_base.endswith("/") or dest_base == "":
+            # Destination is a directory: preserve the structure of directory
+            # sources, otherwise just use the filename
+            is_dir_source = source_pattern.endswith("/") or (not is_glob and source_path_obj.is_dir())
+            mode = "preserve" if is_dir_source else "flatten"
+        else:
+            # Destination is a specific file path
+            mode = "explicit"
+        
+        # Work out every destination up front so the copy workers share no state
+        planned_copies = []
+        for source_file in matching_files:
+            # Matches are plain path strings under the repo, so slice off the prefix
+            relative_path = source_file[root_prefix_len:]
+            if mode == "preserve":
+                dest_file = dest_path / relative_path
+            elif mode == "flatten":
+                dest_file = dest_path / os.path.basename(source_file)
+            else:
+                dest_file = dest_path
+            
+            # YAML is rendered to a Markdown wrapper instead of copied raw
+            if is_yaml_file(source_file):
+                dest_file = dest_file.with_suffix(dest_file.suffix + ".md")
+            planned_copies.append((source_file, relative_path, dest_file))
+        
+        # Copy matching files
+        copied_count += copy_and_report(planned_copies, hardlink)
+        
+        if not matching_files:
+            print(f"  [INFO] No files matched pattern: {source_pattern}")
+    
+    return copied_count
+
+
+def copy_files(source_repo_path, file_mapping, repo_name, hardlink=True):
+    """Copy files from source repository to documentation structure (static mapping)"""
+    copied_count = 0
+    for source_path, dest_path in file_mapping.items():
+        source_file = source_repo_path / source_path
+        dest_file = DOCS_PATH / dest_path
+        
+        if source_file.exists():
+            # Ensure destination directory exists
+            ensure_dirs([dest_file.parent])
+            
+            # Copy file (left alone when it is already up to date)
+            if fast_copy(source_file, dest_file, hardlink):
+                print(f"  [OK] Copied {source_path} -> {dest_path}")
+            else:
+                print(f"  [SKIP] Unchanged {source_path} -> {dest_path}")
+            copied_count += 1
+        else:
+            print(f"  [WARNING] Source file not found: {source_path}")
+    
+    return copied_count
+
+
+def process_repo(config, repo, repo_path, changed_files_list=None, exclude_patterns=(), hardlink=True):
+    """Copy files from a cloned repository into docs/, returning the count of files copied or already up to date"""
+    key = repo["key"]
+    patterns = config.get(f"{key}_patterns")
+    static_paths = config.get(f"{key}_paths")
+    total_copied = 0
+    
+    # Use commit-based copying if available, otherwise use pattern-based
+    copied = 0
+    if changed_files_list and patterns:
+        print("  Copying only changed files that match patterns...")
+        copied = copy_changed_files(
+            repo_path,
+            changed_files_list,
+            patterns,
+            exclude_patterns,
+            repo["name"],
+            hardlink
+        )
+        total_copied += copied
+    
+    # Fallback if commit-based copy finds nothing (common on squash/merge commits)
+    if copied == 0:
+        # Fallback to pattern-based or static mapping (for scheduled/push/manual triggers)
+        # Process static file mappings (backward compatibility)
+        if static_paths:
+            print("  Copying static file mappings...")
+            total_copied += copy_files(repo_path, static_paths, repo["name"], hardlink)
+        
+        # Process pattern-based file copying (dynamic)
+        if patterns:
+            print("  Copying files using patterns...")
+            total_copied += copy_files_by_pattern(
+                repo_path,
+                patterns,
+                exclude_patterns,
+                repo["name"],
+                hardlink
+            )
+    
+    return total_copied
+
+
+def pull_repo(config, repo, temp_path, commit_sha=None, changed_files_list=None, exclude_patterns=(), hardlink=True, use_archive=False, submodule_jobs=None):
+    """Clone or update one configured repository and copy its files into docs/, returning the count"""
+    key = repo["key"]
+    repo_path = clone_or_update_repo(
+        config[f"{key}_repo"],
+        config.get(f"{key}_branch", "main"),
+        temp_path,
+        repo["dir_name"],
+        os.environ.get(repo["token_env"]),
+        commit_sha=commit_sha,
+        sparse_paths=sparse_checkout_paths(config, key),
+        changed_files=parse_changed_files(changed_files_list),
+        use_archive=use_archive,
+        submodule_jobs=submodule_jobs
+    )
+    return process_repo(config, repo, repo_path, changed_files_list, exclude_patterns, hardlink)
+
+
+def determine_repos_to_pull(config):
+    """
+    Determine which repositories to pull based on environment variables.
+    Returns a dict with flags for each repo.
+    """
+    # Get the triggering repository from environment (set by GitHub Actions)
+    trigger_repo = os.environ.get("TRIGGER_REPOSITORY", "").lower()
+    
+    # Default: pull from both repos (for cron, push, manual triggers)
+    pull_messaging_core = True
+    pull_virtual_golf_game_api = True
+    
+    # If triggered by repository_dispatch, only pull from the triggering repo
+    if trigger_repo:
+        print(f"📥 Triggered by repository: {trigger_repo}")
+        
+        # Check if it's messaging-core
+        if "messaging-core" in trigger_repo or "messaging_core" in trigger_repo:
+            pull_messaging_core = True
+            pull_virtual_golf_game_api = False
+            print("  → Will pull from: messaging-core only")
+        # Check if it's virtual-golf-game-api
+        elif "virtual-golf-game-api" in trigger_repo or "virtual_golf_game_api" in trigger_repo:
+            pull_messaging_core = False
+            pull_virtual_golf_game_api = True
+            print("  → Will pull from: virtual-golf-game-api only")
+        else:
+            # Unknown repo, pull from both to be safe
+            print(f"  ⚠️  Unknown repository '{trigger_repo}', will pull from both repos")
+    else:
+        print("📥 No specific repository trigger detected, will pull from both repos")
+    
+    return {
+        "messaging_core": pull_messaging_core,
+        "virtual_golf_game_api": pull_virtual_golf_game_api
+    }
+
+
+def main():
+    """Main function to pull content from repositories"""
+    parser = argparse.ArgumentParser(description="Pull documentation from the source repositories into docs/")
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="delete the cached clones in temp_dir and clone everything again"
+    )
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("Pulling Content from External Repositories")
+    print("=" * 60)
+    
+    # Load configuration and read the global options once
+    config = load_config()
+    temp_dir = config.get("temp_dir", ".temp_repos")
+    # Compiled once here; every copy and match helper accepts the regex as is
+    exclude_patterns = compile_exclude_patterns(tuple(config.get("exclude_patterns", ())))
+    # Copied files are only read by mkdocs, so hardlinks are safe unless disabled
+    hardlink = config.get("hardlink", True)
+    use_archive = config.get("use_git_archive", False)
+    submodule_jobs = (config.get("clone_jobs") or os.cpu_count() or 4) if config.get("with_submodules", False) else None
+    
+    # Determine which repos to pull based on trigger
+    repos_to_pull = determine_repos_to_pull(config)
+    
+    # Setup temporary directory
+    temp_path = ensure_temp_dir(temp_dir, fresh=args.fresh)
+    
+    total_copied = 0
+    
+    # Get commit info if triggered by repository_dispatch
+    trigger_commit = os.environ.get("TRIGGER_COMMIT", "")
+    trigger_changed_files = os.environ.get("TRIGGER_CHANGED_FILES", "")
+    trigger_repo = os.environ.get("TRIGGER_REPOSITORY", "").lower()
+    
+    # Determine if we should use commit-based pulling (only for repository_dispatch)
+    use_commit_based = bool(trigger_commit and trigger_changed_files)
+    
+    if use_commit_based:
+        print(f"\n📋 Commit-based pulling mode enabled")
+        print(f"   Commit: {trigger_commit[:7] if trigger_commit else 'N/A'}")
+        print(f"   Changed files: {len(trigger_changed_files.split(',')) if trigger_changed_files else 0} file(s)")
+    
+    # Work out which repositories to process in this run
+    jobs = []
+    for index, repo in enumerate(REPOSITORIES, start=1):
+        key = repo["key"]
+        if f"{key}_repo" in config and repos_to_pull[key]:
+            # Get commit SHA and changed files if this is the triggering repo
+            is_trigger = use_commit_based and repo["name"] in trigger_repo
+            jobs.append((
+                index,
+                repo,
+                trigger_commit if is_trigger else None,
+                trigger_changed_files if is_trigger else None,
+            ))
+        elif repos_to_pull[key]:
+            print(f"\n⚠️  Warning: {repo['name']} repository not configured in config.json")
+        else:
+            print(f"\n⏭️  Skipping {repo['name']} (not triggered by this repository)")
+    
+    # Pull the repositories concurrently (they share no clone or docs/ paths);
+    # each one's output is buffered and printed in order once it is done
+    output = ThreadOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            pulls = []
+            for index, repo, commit_sha, changed_files_list in jobs:
+                buffer = io.StringIO()
+                future = pool.submit(
+                    output.run_buffered,
+                    buffer,
+                    pull_repo,
+                    config,
+                    repo,
+                    temp_path,
+                    commit_sha,
+                    changed_files_list,
+                    exclude_patterns=exclude_patterns,
+                    hardlink=hardlink,
+                    use_archive=use_archive,
+                    submodule_jobs=submodule_jobs
+                )
+                pulls.append((index, repo, buffer, future))
+            
+            # After a pass fails (e.g. sys.exit on a clone error), passes that
+            # have not started are cancelled and running ones are still reported
+            failure = None
+            for index, repo, buffer, future in pulls:
+                if failure is not None and future.cancel():
+                    continue
+                print(f"\n[{index}/{len(REPOSITORIES)}] Processing {repo['name']} Repository...")
+                try:
+                    total_copied += future.result()
+                except (Exception, SystemExit) as e:
+                    if failure is None:
+                        failure = e
+                finally:
+                    print(buffer.getvalue(), end="")
+            if failure is not None:
+                raise failure
+    finally:
+        sys.stdout = output.stream
+    
+    # Summary
+    print("\n" + "=" * 60)
+    if total_copied > 0:
+        print(f"[SUCCESS] Successfully copied {total_copied} file(s)")
+    else:
+        print("[WARNING] No files were copied. Check your configuration.")
+    print("=" * 60)
+    print("\nNext steps:")
+    print("  1. Review the copied files in the docs/ directory")
+    print("  2. Update mkdocs.yml navigation if new files were added")
+    print("  3. Build the documentation: mkdocs build")
+    print("  4. Serve locally: mkdocs serve")
+
+    # Clean up any raw YAML files under docs/ to avoid mkdocs path collisions
+    if DOCS_PATH.exists():
+        removed_yaml = remove_raw_yaml(DOCS_PATH)
+        if removed_yaml:
+            print(f"[INFO] Removed {removed_yaml} raw YAML file(s) from docs/")
+
+
+if __name__ == "__main__":
+    main()
+